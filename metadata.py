@@ -1,186 +1,363 @@
+import io
 import os
 import json
+import functools
+import shutil
+import sqlite3
+import argparse
 import subprocess
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tqdm import tqdm
 from pathlib import Path
 from datetime import datetime
 
-def check_ffprobe_installed():
-    """Check if FFprobe is installed and accessible"""
+try:
+    import orjson  # Optional: several times faster than the stdlib json parser
+except ImportError:
+    orjson = None
+
+# SQLite file caching FFprobe output between runs
+CACHE_FILE = "metadata_cache.sqlite"
+
+# Default value for every parsed metadata field, in report order
+METADATA_DEFAULTS = {
+    'filepath': '',
+    'filename': '',
+    'file_size_bytes': 0,
+    'file_size_mb': 0,
+    'duration_seconds': 0,
+    'format_name': '',
+    'format_long_name': '',
+    'bit_rate': 0,
+    'video_codec': '',
+    'video_codec_long': '',
+    'resolution': '',
+    'width': 0,
+    'height': 0,
+    'frame_rate': '',
+    'aspect_ratio': '',
+    'pixel_format': '',
+    'video_bitrate': '',
+    'audio_codec': '',
+    'audio_codec_long': '',
+    'audio_channels': 0,
+    'audio_channel_layout': '',
+    'audio_sample_rate': '',
+    'audio_bitrate': '',
+    'has_video': False,
+    'has_audio': False,
+    'has_subtitles': False,
+    'subtitle_count': 0,
+    'extraction_timestamp': '',
+}
+
+# Excel summary layout: (column header, metadata key)
+EXCEL_COLUMNS = [
+    ('Filename', 'filename'),
+    ('Format', 'format_long_name'),
+    ('Duration (seconds)', 'duration_seconds'),
+    ('Size (MB)', 'file_size_mb'),
+    ('Resolution', 'resolution'),
+    ('Width', 'width'),
+    ('Height', 'height'),
+    ('Video Codec', 'video_codec'),
+    ('Frame Rate', 'frame_rate'),
+    ('Aspect Ratio', 'aspect_ratio'),
+    ('Audio Codec', 'audio_codec'),
+    ('Audio Channels', 'audio_channels'),
+    ('Sample Rate', 'audio_sample_rate'),
+    ('Has Subtitles', 'has_subtitles'),
+    ('Subtitle Count', 'subtitle_count'),
+    ('Extraction Time', 'extraction_timestamp'),
+    ('File Path', 'filepath'),
+]
+
+# Stream and format fields read by parse_metadata()
+FFPROBE_STREAM_ENTRIES = [
+    'codec_type', 'codec_name', 'codec_long_name', 'width', 'height',
+    'r_frame_rate', 'display_aspect_ratio', 'pix_fmt', 'bit_rate',
+    'channels', 'channel_layout', 'sample_rate',
+]
+FFPROBE_FORMAT_ENTRIES = ['duration', 'format_name', 'format_long_name', 'bit_rate']
+
+# FFprobe options shared by every probe. Only the fields that are actually
+# reported are requested, so tags and dispositions never reach the JSON parser;
+# file size comes from os.stat().
+FFPROBE_ARGS = [
+    '-v', 'quiet',
+    '-print_format', 'json',
+    '-show_entries',
+    f"stream={','.join(FFPROBE_STREAM_ENTRIES)}:format={','.join(FFPROBE_FORMAT_ENTRIES)}",
+]
+
+def print_ffprobe_install_instructions():
+    """Explain how to install FFprobe on each platform"""
+    print("\n" + "="*70)
+    print("INSTALLATION INSTRUCTIONS")
+    print("="*70)
+    print("\nWindows:")
+    print("  1. Visit: https://www.gyan.dev/ffmpeg/builds/")
+    print("  2. Download 'ffmpeg-release-essentials.zip'")
+    print("  3. Extract and add the 'bin' folder to System PATH")
+    print("  4. Restart terminal and run this script again")
+    print("\nLinux/Ubuntu:")
+    print("  sudo apt-get update")
+    print("  sudo apt-get install ffmpeg")
+    print("\nmacOS:")
+    print("  brew install ffmpeg")
+    print("\nAfter installation, verify with: ffprobe -version")
+    print("="*70)
+
+@functools.lru_cache(maxsize=None)
+def check_ffprobe_installed(verify_version=False):
+    """Check if FFprobe is installed and accessible
+    
+    A PATH lookup is enough by default; pass verify_version=True to also
+    run 'ffprobe -version' and confirm the binary actually starts.
+    """
+    ffprobe_path = shutil.which('ffprobe')
+    if not ffprobe_path:
+        print("❌ FFprobe not found!")
+        print_ffprobe_install_instructions()
+        return False
+    
+    if not verify_version:
+        print(f"✅ FFprobe found: {ffprobe_path}")
+        return True
+    
     try:
-        result = subprocess.run(['ffprobe', '-version'], 
+        result = subprocess.run([ffprobe_path, '-version'], 
                               capture_output=True, text=True)
         if result.returncode == 0:
             version_line = result.stdout.split('\n')[0]
             print(f"✅ FFprobe found: {version_line}")
             return True
-    except FileNotFoundError:
-        print("❌ FFprobe not found!")
-        print("\n" + "="*70)
-        print("INSTALLATION INSTRUCTIONS")
-        print("="*70)
-        print("\nWindows:")
-        print("  1. Visit: https://www.gyan.dev/ffmpeg/builds/")
-        print("  2. Download 'ffmpeg-release-essentials.zip'")
-        print("  3. Extract and add the 'bin' folder to System PATH")
-        print("  4. Restart terminal and run this script again")
-        print("\nLinux/Ubuntu:")
-        print("  sudo apt-get update")
-        print("  sudo apt-get install ffmpeg")
-        print("\nmacOS:")
-        print("  brew install ffmpeg")
-        print("\nAfter installation, verify with: ffprobe -version")
-        print("="*70)
-        return False
+    except OSError as e:
+        print(f"❌ FFprobe could not be started: {str(e)}")
     return False
 
-def extract_video_metadata(video_path):
-    """Extract detailed metadata from a video file using FFprobe"""
+def _loads_json(data):
+    """Parse JSON bytes, preferring orjson when it is installed"""
     try:
-        cmd = [
-            'ffprobe',
-            '-v', 'quiet',
-            '-print_format', 'json',
-            '-show_format',
-            '-show_streams',
-            video_path
-        ]
+        return orjson.loads(data) if orjson else json.loads(data)
+    except ValueError:
+        # Replace invalid UTF-8 (e.g. in tags) instead of failing the whole file
+        text = data.decode('utf-8', errors='replace')
+        return orjson.loads(text) if orjson else json.loads(text)
+
+def _dumps_json(obj, indent=False):
+    """Serialise obj to UTF-8 JSON bytes, preferring orjson when it is installed"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def extract_video_metadata(video_path, log=print):
+    """Extract detailed metadata from a video file using FFprobe
+    
+    Error messages go to log, which pool threads point at the run's report
+    instead of the console.
+    """
+    try:
+        cmd = ['ffprobe', *FFPROBE_ARGS, video_path]
         
-        # Use utf-8 encoding and handle errors gracefully
-        result = subprocess.run(
-            cmd, 
-            capture_output=True, 
-            text=True,
-            encoding='utf-8',
-            errors='replace'  # Replace problematic characters instead of crashing
-        )
+        # Keep the raw bytes; JSON parsing handles the UTF-8 decoding
+        result = subprocess.run(cmd, capture_output=True)
         
         if result.returncode == 0 and result.stdout:
             try:
-                return json.loads(result.stdout)
-            except json.JSONDecodeError as je:
-                print(f"   ❌ JSON decode error: {str(je)}")
+                return _loads_json(result.stdout)
+            except ValueError as je:
+                log(f"   ❌ JSON decode error: {str(je)}")
                 return None
         else:
             if result.stderr:
-                print(f"   ❌ FFprobe error: {result.stderr[:200]}")
+                log(f"   ❌ FFprobe error: {result.stderr[:200].decode('utf-8', errors='replace').strip()}")
             return None
             
     except Exception as e:
-        print(f"   ❌ Error: {str(e)}")
+        log(f"   ❌ Error: {str(e)}")
         return None
 
-def parse_metadata(raw_metadata, filepath):
-    """Parse FFprobe output into structured data"""
+def open_metadata_cache(cache_file=CACHE_FILE):
+    """Open (and create if needed) the persistent FFprobe output cache"""
+    conn = sqlite3.connect(cache_file)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS metadata_cache ('
+        'path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, json BLOB)'
+    )
+    return conn
+
+def _cache_key(path):
+    """Identify a file by (absolute path, mtime, size) for cache lookups"""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+def get_cached_metadata(conn, key):
+    """Return cached FFprobe output for an unchanged file, or None"""
+    path, mtime, size = key
+    row = conn.execute(
+        'SELECT json FROM metadata_cache WHERE path = ? AND mtime = ? AND size = ?',
+        (path, mtime, size)
+    ).fetchone()
+    if row is None:
+        return None
+    try:
+        return _loads_json(row[0])
+    except ValueError:
+        return None
+
+def store_cached_metadata(conn, entries):
+    """Save (key, raw_metadata) pairs to the cache in a single transaction"""
+    with conn:
+        conn.executemany(
+            'INSERT OR REPLACE INTO metadata_cache (path, mtime, size, json) VALUES (?, ?, ?, ?)',
+            [(*key, _dumps_json(raw)) for key, raw in entries]
+        )
+
+def _to_number(value, cast):
+    """Convert an FFprobe value with cast, treating 'N/A' and garbage as 0"""
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return cast(0)
+
+def parse_format_numbers(fmt):
+    """Return (duration_seconds, bit_rate) for a format section"""
+    g = fmt.get
+    duration = _to_number(g('duration', 0), float)
+    bit_rate = _to_number(g('bit_rate', 0), int)
+    return round(duration, 2), bit_rate
+
+def parse_metadata(raw_metadata, filepath, extraction_timestamp=None, file_size=None):
+    """Parse FFprobe output into structured data
+    
+    file_size may be passed when the caller has already stat()ed the file.
+    """
     if not raw_metadata:
         return None
     
-    parsed = {
-        'filepath': filepath,
-        'filename': os.path.basename(filepath),
-        'file_size_bytes': 0,
-        'file_size_mb': 0,
-        'duration_seconds': 0,
-        'format_name': '',
-        'format_long_name': '',
-        'bit_rate': 0,
-        'video_codec': '',
-        'video_codec_long': '',
-        'resolution': '',
-        'width': 0,
-        'height': 0,
-        'frame_rate': '',
-        'aspect_ratio': '',
-        'pixel_format': '',
-        'video_bitrate': '',
-        'audio_codec': '',
-        'audio_codec_long': '',
-        'audio_channels': 0,
-        'audio_channel_layout': '',
-        'audio_sample_rate': '',
-        'audio_bitrate': '',
-        'has_video': False,
-        'has_audio': False,
-        'has_subtitles': False,
-        'subtitle_count': 0,
-        'extraction_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    }
+    # Copying a prebuilt template is cheaper than rebuilding the literal per file
+    parsed = dict(METADATA_DEFAULTS)
+    parsed['filepath'] = filepath
+    parsed['filename'] = os.path.basename(filepath)
+    parsed['extraction_timestamp'] = (
+        extraction_timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    )
+    
+    # File size comes straight from the filesystem rather than from FFprobe
+    if file_size is None:
+        try:
+            file_size = os.stat(filepath).st_size
+        except OSError:
+            file_size = 0
+    parsed['file_size_bytes'] = file_size
+    parsed['file_size_mb'] = round(file_size / 1048576, 2)
     
     # Parse format information
     if 'format' in raw_metadata:
         fmt = raw_metadata['format']
-        parsed['file_size_bytes'] = int(fmt.get('size', 0))
-        parsed['file_size_mb'] = round(int(fmt.get('size', 0)) / (1024 * 1024), 2)
-        parsed['duration_seconds'] = round(float(fmt.get('duration', 0)), 2)
-        parsed['format_name'] = fmt.get('format_name', '')
-        parsed['format_long_name'] = fmt.get('format_long_name', '')
-        parsed['bit_rate'] = int(fmt.get('bit_rate', 0))
+        parsed['duration_seconds'], parsed['bit_rate'] = parse_format_numbers(fmt)
+        g = fmt.get
+        parsed['format_name'] = g('format_name', '')
+        parsed['format_long_name'] = g('format_long_name', '')
     
     # Parse streams
     if 'streams' in raw_metadata:
-        video_streams = []
-        audio_streams = []
-        subtitle_count = 0
-        
+        # Sort streams by type in one pass via bound append methods
+        buckets = {'video': [], 'audio': [], 'subtitle': []}
+        append = {codec_type: bucket.append for codec_type, bucket in buckets.items()}
         for stream in raw_metadata['streams']:
-            codec_type = stream.get('codec_type', '')
-            
-            if codec_type == 'video':
-                video_streams.append(stream)
-                parsed['has_video'] = True
-            elif codec_type == 'audio':
-                audio_streams.append(stream)
-                parsed['has_audio'] = True
-            elif codec_type == 'subtitle':
-                subtitle_count += 1
-                parsed['has_subtitles'] = True
+            add = append.get(stream.get('codec_type'))
+            if add:
+                add(stream)
         
-        parsed['subtitle_count'] = subtitle_count
+        video_streams = buckets['video']
+        audio_streams = buckets['audio']
+        parsed['has_video'] = bool(video_streams)
+        parsed['has_audio'] = bool(audio_streams)
+        parsed['has_subtitles'] = bool(buckets['subtitle'])
+        parsed['subtitle_count'] = len(buckets['subtitle'])
         
         # Get primary video stream info
         if video_streams:
-            video = video_streams[0]
-            parsed['video_codec'] = video.get('codec_name', '')
-            parsed['video_codec_long'] = video.get('codec_long_name', '')
-            parsed['width'] = video.get('width', 0)
-            parsed['height'] = video.get('height', 0)
-            parsed['resolution'] = f"{video.get('width', 0)}x{video.get('height', 0)}"
-            parsed['frame_rate'] = video.get('r_frame_rate', '')
-            parsed['aspect_ratio'] = video.get('display_aspect_ratio', '')
-            parsed['pixel_format'] = video.get('pix_fmt', '')
-            parsed['video_bitrate'] = video.get('bit_rate', 'N/A')
+            vg = video_streams[0].get  # Bind once; saves an attribute lookup per field
+            width = vg('width', 0)
+            height = vg('height', 0)
+            parsed['video_codec'] = vg('codec_name', '')
+            parsed['video_codec_long'] = vg('codec_long_name', '')
+            parsed['width'] = width
+            parsed['height'] = height
+            parsed['resolution'] = f"{width}x{height}"
+            parsed['frame_rate'] = vg('r_frame_rate', '')
+            parsed['aspect_ratio'] = vg('display_aspect_ratio', '')
+            parsed['pixel_format'] = vg('pix_fmt', '')
+            parsed['video_bitrate'] = vg('bit_rate', 'N/A')
         
         # Get primary audio stream info
         if audio_streams:
-            audio = audio_streams[0]
-            parsed['audio_codec'] = audio.get('codec_name', '')
-            parsed['audio_codec_long'] = audio.get('codec_long_name', '')
-            parsed['audio_channels'] = audio.get('channels', 0)
-            parsed['audio_channel_layout'] = audio.get('channel_layout', '')
-            parsed['audio_sample_rate'] = audio.get('sample_rate', '')
-            parsed['audio_bitrate'] = audio.get('bit_rate', 'N/A')
+            ag = audio_streams[0].get
+            parsed['audio_codec'] = ag('codec_name', '')
+            parsed['audio_codec_long'] = ag('codec_long_name', '')
+            parsed['audio_channels'] = ag('channels', 0)
+            parsed['audio_channel_layout'] = ag('channel_layout', '')
+            parsed['audio_sample_rate'] = ag('sample_rate', '')
+            parsed['audio_bitrate'] = ag('bit_rate', 'N/A')
     
     return parsed
 
 def scan_folder_for_videos(folder_path):
-    """Scan folder for video files and remove duplicates"""
-    video_extensions = ['.mkv', '.mp4', '.avi', '.mov', '.webm', '.flv', '.m4v', '.wmv']
-    video_files = set()  # Use set to avoid duplicates
+    """Scan folder for video files in a single directory pass"""
+    video_extensions = {'.mkv', '.mp4', '.avi', '.mov', '.webm', '.flv', '.m4v', '.wmv'}
     
     folder = Path(folder_path)
     if not folder.exists():
         print(f"❌ Folder not found: {folder_path}")
         return []
     
-    for ext in video_extensions:
-        video_files.update(folder.glob(f'*{ext}'))
-        video_files.update(folder.glob(f'*{ext.upper()}'))
+    # os.scandir reuses the entry type from the directory listing, and the
+    # case-insensitive extension check covers both .mp4 and .MP4 at once
+    with os.scandir(folder) as entries:
+        video_files = [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in video_extensions
+        ]
+    
+    return sorted(video_files)
+
+def write_excel_summary(all_metadata, excel_filename):
+    """Stream the metadata summary row by row into an Excel workbook"""
+    # Imported lazily so the extractor starts fast and never builds a DataFrame
+    import xlsxwriter
     
-    # Convert set back to sorted list
-    return sorted(list(video_files))
+    workbook = xlsxwriter.Workbook(excel_filename, {'constant_memory': True})
+    try:
+        worksheet = workbook.add_worksheet('Video Metadata')
+        worksheet.write_row(0, 0, [header for header, _ in EXCEL_COLUMNS])
+        for row, meta in enumerate(all_metadata, 1):
+            worksheet.write_row(row, 0, [meta[key] for _, key in EXCEL_COLUMNS])
+    finally:
+        workbook.close()
+
+def get_worker_count(cli_workers=None):
+    """Resolve the number of parallel FFprobe workers (CLI > env > default)"""
+    workers = cli_workers or os.getenv('METADATA_WORKERS')
+    if workers:
+        try:
+            return max(1, int(workers))
+        except ValueError:
+            print(f"⚠️  Invalid worker count '{workers}', using default")
+    # FFprobe runs are I/O and spawn bound, so oversubscribe the CPUs
+    return min(32, (os.cpu_count() or 1) * 4)
 
 def main():
     """Main function to extract metadata from downloaded videos"""
+    parser = argparse.ArgumentParser(description="Extract metadata from downloaded videos")
+    parser.add_argument('--workers', type=int,
+                        help="Number of parallel FFprobe workers (env: METADATA_WORKERS)")
+    parser.add_argument('--verify-version', action='store_true',
+                        help="Run 'ffprobe -version' instead of only checking PATH")
+    args = parser.parse_args()
     
     print("="*70)
     print("VIDEO METADATA EXTRACTOR")
@@ -188,7 +365,7 @@ def main():
     print()
     
     # Check FFprobe installation
-    if not check_ffprobe_installed():
+    if not check_ffprobe_installed(args.verify_version):
         print("\n⚠️  Cannot proceed without FFprobe. Please install it first.")
         input("\nPress Enter to exit...")
         return
@@ -225,47 +402,106 @@ def main():
     print("="*70)
     print()
     
-    # Extract metadata from each video
-    all_metadata = []
-    successful = 0
-    failed = 0
-    failed_files = []  # Track which files failed
+    # Extract metadata from each video in parallel
+    workers = get_worker_count(args.workers)
+    print(f"⚙️  Using {workers} parallel worker(s)\n")
     
-    for idx, video_path in enumerate(video_files, 1):
-        filename = video_path.name
-        print(f"[{idx}/{len(video_files)}] {filename}")
+    # One slot per scanned file, filled in place so results keep scan order
+    all_metadata = [None] * len(video_files)
+    failures = [None] * len(video_files)  # Failure reason per file
+    notes = [[] for _ in video_files]  # FFprobe error messages per file
+    
+    # Serve unchanged files from the cache; only probe new or modified ones
+    cache = open_metadata_cache()
+    new_entries = []  # (key, raw_metadata) pairs to write back to the cache
+    try:
+        extracted = []  # (idx, video_path, key, raw_metadata) served from the cache
+        pending = []
+        for idx, video_path in enumerate(video_files, 1):
+            try:
+                key = _cache_key(video_path)
+            except OSError as e:
+                # Unreadable files are skipped and logged like missing ones
+                if isinstance(e, FileNotFoundError):
+                    failures[idx - 1] = "File not found"
+                else:
+                    failures[idx - 1] = f"Cannot access file: {e.strerror or e}"
+                continue
+            raw_metadata = get_cached_metadata(cache, key)
+            if raw_metadata is not None:
+                extracted.append((idx, video_path, key, raw_metadata))
+            else:
+                pending.append((idx, video_path, key))
         
-        if not video_path.exists():
-            print("   ⚠️  File not found, skipping...")
-            failed += 1
-            failed_files.append((filename, "File not found"))
-            continue
+        if extracted:
+            print(f"💾 {len(extracted)} file(s) loaded from cache, {len(pending)} to probe\n")
         
-        # Extract metadata
-        raw_metadata = extract_video_metadata(str(video_path))
+        total = len(extracted) + len(pending)
+        extraction_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        if raw_metadata:
-            parsed = parse_metadata(raw_metadata, str(video_path))
+        def iter_extracted(futures):
+            yield from extracted
+            for future in as_completed(futures):
+                idx, video_path, key = futures[future]
+                raw_metadata = future.result()
+                if raw_metadata:
+                    new_entries.append((key, raw_metadata))
+                yield idx, video_path, key, raw_metadata
+        
+        # Probe the remaining files in parallel; each call is its own FFprobe process
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(extract_video_metadata, str(video_path), notes[idx - 1].append):
+                    (idx, video_path, key)
+                for idx, video_path, key in pending
+            }
             
-            if parsed:
-                all_metadata.append(parsed)
-                successful += 1
-                
-                # Display key info
-                print(f"   ✅ Resolution: {parsed['resolution']}")
-                print(f"   ✅ Duration: {parsed['duration_seconds']}s")
-                print(f"   ✅ Size: {parsed['file_size_mb']} MB")
-                print(f"   ✅ Video: {parsed['video_codec']} | Audio: {parsed['audio_codec']}")
-            else:
-                print("   ❌ Failed to parse metadata")
-                failed += 1
-                failed_files.append((filename, "Failed to parse metadata"))
-        else:
-            print("   ❌ Failed to extract metadata")
-            failed += 1
-            failed_files.append((filename, "Failed to extract metadata"))
+            # Only the progress bar is drawn while files are processed; the
+            # per-file details are printed afterwards in scan order
+            for idx, video_path, key, raw_metadata in tqdm(iter_extracted(futures), total=total, unit='file'):
+                if not raw_metadata:
+                    failures[idx - 1] = "Failed to extract metadata"
+                    continue
+                # Reuse the size from the cache key's stat() call
+                parsed = parse_metadata(raw_metadata, str(video_path), extraction_timestamp, key[2])
+                if parsed:
+                    all_metadata[idx - 1] = parsed
+                else:
+                    failures[idx - 1] = "Failed to parse metadata"
+    finally:
+        # Keep what was probed even if the run is interrupted
+        if new_entries:
+            store_cached_metadata(cache, new_entries)
+        cache.close()
+    
+    report = io.StringIO()
+    failed_files = []  # Track which files failed
+    for idx, video_path in enumerate(video_files, 1):
+        report.write(f"[{idx}/{len(video_files)}] {video_path.name}\n")
+        for note in notes[idx - 1]:
+            report.write(f"{note}\n")
         
-        print()
+        parsed = all_metadata[idx - 1]
+        if parsed:
+            report.write(
+                f"   ✅ Resolution: {parsed['resolution']}\n"
+                f"   ✅ Duration: {parsed['duration_seconds']}s\n"
+                f"   ✅ Size: {parsed['file_size_mb']} MB\n"
+                f"   ✅ Video: {parsed['video_codec']} | Audio: {parsed['audio_codec']}\n"
+            )
+        else:
+            reason = failures[idx - 1]
+            report.write(f"   ❌ {reason}\n")
+            failed_files.append((video_path.name, reason))
+        report.write("\n")
+    successful = len(video_files) - len(failed_files)
+    failed = len(failed_files)
+    
+    print()
+    print(report.getvalue(), end='')
+    
+    # Drop the slots of files that failed
+    all_metadata = [parsed for parsed in all_metadata if parsed is not None]
     
     # Save results
     if all_metadata:
@@ -273,35 +509,12 @@ def main():
         
         # 1. Save detailed JSON
         json_filename = f"video_metadata_{timestamp}.json"
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(all_metadata, f, indent=2, ensure_ascii=False)
+        with open(json_filename, 'wb') as f:
+            f.write(_dumps_json(all_metadata, indent=True))
         
         # 2. Create Excel summary
-        excel_data = []
-        for meta in all_metadata:
-            excel_data.append({
-                'Filename': meta['filename'],
-                'Format': meta['format_long_name'],
-                'Duration (seconds)': meta['duration_seconds'],
-                'Size (MB)': meta['file_size_mb'],
-                'Resolution': meta['resolution'],
-                'Width': meta['width'],
-                'Height': meta['height'],
-                'Video Codec': meta['video_codec'],
-                'Frame Rate': meta['frame_rate'],
-                'Aspect Ratio': meta['aspect_ratio'],
-                'Audio Codec': meta['audio_codec'],
-                'Audio Channels': meta['audio_channels'],
-                'Sample Rate': meta['audio_sample_rate'],
-                'Has Subtitles': meta['has_subtitles'],
-                'Subtitle Count': meta['subtitle_count'],
-                'Extraction Time': meta['extraction_timestamp'],
-                'File Path': meta['filepath']
-            })
-        
-        df = pd.DataFrame(excel_data)
         excel_filename = f"video_metadata_summary_{timestamp}.xlsx"
-        df.to_excel(excel_filename, index=False, sheet_name='Video Metadata')
+        write_excel_summary(all_metadata, excel_filename)
         
         # Print summary
         print("="*70)
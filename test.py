@@ -1,11 +1,20 @@
 import streamlit as st
 import os
 import pandas as pd
+from openpyxl import load_workbook
 from pathlib import Path
 import subprocess
+import tempfile
+import shutil
 import time
 from datetime import datetime
 import io
+import re
+import hashlib
+from urllib.parse import urlparse, parse_qs
+
+# yt-dlp starts per-video lines with '[extractor] <video id>: ', errors included
+VIDEO_LINE_RE = re.compile(r"^(?:ERROR: )?\[[^\]]+\] ([\w-]+): ")
 
 # Page configuration
 st.set_page_config(
@@ -117,27 +126,6 @@ st.markdown("""
         margin: 1rem 0;
     }
     
-    /* Download status */
-    .download-item {
-        background: rgba(102, 126, 234, 0.1);
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 0.5rem 0;
-        border-left: 4px solid #667eea;
-    }
-    
-    /* Success status */
-    .status-success {
-        border-left-color: #38ef7d;
-        background: rgba(56, 239, 125, 0.1);
-    }
-    
-    /* Failed status */
-    .status-failed {
-        border-left-color: #f45c43;
-        background: rgba(244, 92, 67, 0.1);
-    }
-    
     /* File uploader */
     .uploadedFile {
         border: 2px dashed #667eea;
@@ -146,32 +134,109 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def download_video(url, output_folder, cookie_file, progress_callback=None):
-    """Download video using cookies with progress callback"""
+def download_video(batch_file, output_folder, cookie_file, success_file, log_file):
+    """Start one yt-dlp process that downloads every URL listed in batch_file
+    
+    Progress and errors are written line by line to log_file, and the URL of
+    every finished video is appended to success_file.
+    """
+    if not os.path.exists(cookie_file):
+        raise FileNotFoundError("Cookie file not found")
+    
+    cmd = [
+        'yt-dlp',
+        '--cookies', cookie_file,
+        '-f', 'bestvideo[height<=1080][ext=mp4]+bestaudio[ext=m4a]/best[height<=1080]',
+        '--merge-output-format', 'mp4',
+        '-o', f'{output_folder}/%(title)s.%(ext)s',
+        '--no-warnings',
+        '--progress',
+        '--newline',
+        # Keep going with the rest of the batch when one URL fails
+        '--ignore-errors',
+        # Pace requests inside yt-dlp instead of blocking between downloads
+        '--sleep-interval', '1',
+        '--max-sleep-interval', '3',
+        '--print-to-file', 'after_move:%(original_url)s', str(success_file),
+        '--batch-file', str(batch_file)
+    ]
+    
+    return subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT)
+
+def extract_video_id(url):
+    """Return the YouTube video ID of a URL, or None if it can't be found"""
+    parsed = urlparse(url)
+    if parsed.hostname and parsed.hostname.endswith('youtu.be'):
+        return parsed.path.strip('/').split('/')[0] or None
+    video_id = parse_qs(parsed.query).get('v', [None])[0]
+    if video_id:
+        return video_id
+    parts = parsed.path.strip('/').split('/')
+    if len(parts) >= 2 and parts[0] in ('shorts', 'live', 'embed'):
+        return parts[1]
+    return None
+
+def read_new_lines(handle):
+    """Return the complete lines appended to an open file since the last call"""
+    lines = []
+    while True:
+        position = handle.tell()
+        line = handle.readline()
+        if not line.endswith('\n'):
+            # Partial line still being written; re-read it on the next call
+            handle.seek(position)
+            return lines
+        lines.append(line.rstrip('\n'))
+
+def iter_excel_urls(excel_file):
+    """Stream URLs from the 'URL'/'url' column (or the first column) of a workbook"""
+    if excel_file.name.lower().endswith('.xls'):
+        # openpyxl cannot read legacy .xls workbooks
+        df = pd.read_excel(excel_file)
+        if 'URL' in df.columns:
+            values = df['URL']
+        elif 'url' in df.columns:
+            values = df['url']
+        else:
+            values = df.iloc[:, 0]
+        for value in values.dropna():
+            yield str(value).strip()
+        return
+    
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
     try:
-        if not os.path.exists(cookie_file):
-            return False, "Cookie file not found"
-        
-        cmd = [
-            'yt-dlp',
-            '--cookies', cookie_file,
-            '-f', 'bestvideo[height<=1080][ext=mp4]+bestaudio[ext=m4a]/best[height<=1080]',
-            '--merge-output-format', 'mp4',
-            '-o', f'{output_folder}/%(title)s.%(ext)s',
-            '--no-warnings',
-            '--progress',
-            url
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
         
-        if result.returncode == 0:
-            return True, "Success"
+        if 'URL' in header:
+            col = header.index('URL')
+        elif 'url' in header:
+            col = header.index('url')
         else:
-            return False, result.stderr or "Unknown error"
-            
-    except Exception as e:
-        return False, str(e)
+            col = 0
+        
+        for row in rows:
+            if col < len(row) and row[col] is not None:
+                yield str(row[col]).strip()
+    finally:
+        workbook.close()
+
+def add_download_result(idx, url, success, message=""):
+    """Record the outcome of a single video download in the results table"""
+    st.session_state.results.append({
+        'Video': idx,
+        'Status': "✅ Downloaded" if success else "❌ Failed",
+        'URL': url,
+        'Error': "" if success else message[:200],
+    })
+
+def show_download_results(placeholder):
+    """Redraw the results table in place"""
+    if st.session_state.results:
+        results_df = pd.DataFrame(st.session_state.results).set_index('Video')
+        placeholder.dataframe(results_df, use_container_width=True)
 
 def main():
     # Header
@@ -193,6 +258,15 @@ def main():
             help="Folder where videos will be saved"
         )
         
+        st.number_input(
+            "Parallel Downloads",
+            min_value=1,
+            max_value=16,
+            value=4,
+            key="workers",
+            help="Number of videos downloaded at the same time"
+        )
+        
         st.divider()
         
         st.subheader("📋 Instructions")
@@ -244,24 +318,19 @@ def main():
     if cookie_file and excel_file:
         st.success("✅ Both files uploaded successfully!")
         
-        # Save cookie file temporarily
+        # Save cookie file temporarily, but only rewrite it when the upload
+        # changed (or was cleaned up) rather than on every script rerun
         cookie_path = "temp_cookies.txt"
-        with open(cookie_path, 'wb') as f:
-            f.write(cookie_file.getbuffer())
+        cookie_hash = hashlib.blake2b(cookie_file.getbuffer(), digest_size=16).hexdigest()
+        if st.session_state.get('cookie_hash') != cookie_hash or not os.path.exists(cookie_path):
+            with open(cookie_path, 'wb') as f:
+                f.write(cookie_file.getbuffer())
+            st.session_state['cookie_hash'] = cookie_hash
         
         # Read Excel file
         try:
-            df = pd.read_excel(excel_file)
-            
-            # Find URL column
-            if 'URL' in df.columns:
-                urls = df['URL'].dropna().tolist()
-            elif 'url' in df.columns:
-                urls = df['url'].dropna().tolist()
-            else:
-                urls = df.iloc[:, 0].dropna().tolist()
-            
-            urls = [str(url).strip() for url in urls]
+            # Drop blanks and repeated URLs while keeping the sheet order
+            urls = list(dict.fromkeys(url for url in iter_excel_urls(excel_file) if url))
             
             st.info(f"📹 Found **{len(urls)}** videos to download")
             
@@ -297,42 +366,117 @@ def main():
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                successful = 0
-                failed = 0
+                succeeded_urls = set()
                 failed_urls = []
+                url_errors = {}  # First yt-dlp error reported for each URL
+                positions = {url: idx for idx, url in enumerate(urls, 1)}
+                url_by_id = {}
+                for url in urls:
+                    video_id = extract_video_id(url)
+                    if video_id:
+                        url_by_id[video_id] = url
                 
-                # Download container
-                download_container = st.container()
+                # One table widget updated in place instead of a block per video
+                st.session_state.results = []
+                results_table = st.empty()
                 
-                for idx, url in enumerate(urls, 1):
-                    with download_container:
-                        status_text.text(f"Downloading {idx}/{len(urls)}: {url[:50]}...")
+                # Split the URLs across a few long-running yt-dlp processes, each
+                # reading its share from a batch file, instead of one process per URL
+                workers = min(st.session_state.get('workers', 4), len(urls))
+                batch_dir = Path(tempfile.mkdtemp(prefix="yt_batch_"))
+                shards = []
+                try:
+                    for n in range(workers):
+                        shard_urls = urls[n::workers]
+                        batch_file = batch_dir / f"urls_{n}.txt"
+                        batch_file.write_text("\n".join(shard_urls) + "\n", encoding="utf-8")
+                        success_file = batch_dir / f"done_{n}.txt"
+                        log_path = batch_dir / f"log_{n}.txt"
                         
-                        success, message = download_video(url, output_folder, cookie_path)
+                        with open(log_path, 'wb') as log_file:
+                            process = download_video(batch_file, output_folder, cookie_path, success_file, log_file)
                         
-                        if success:
-                            successful += 1
-                            st.markdown(f"""
-                            <div class="download-item status-success">
-                                ✅ <strong>Video {idx}:</strong> Downloaded successfully<br>
-                                <small>{url[:80]}...</small>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        else:
-                            failed += 1
-                            failed_urls.append(url)
-                            st.markdown(f"""
-                            <div class="download-item status-failed">
-                                ❌ <strong>Video {idx}:</strong> Failed<br>
-                                <small>{url[:80]}...</small><br>
-                                <small style="color: #f45c43;">Error: {message[:100]}</small>
-                            </div>
-                            """, unsafe_allow_html=True)
+                        shards.append({
+                            'urls': shard_urls,
+                            'process': process,
+                            'log': open(log_path, encoding='utf-8', errors='replace'),
+                            'success_file': success_file,
+                            'success': None,
+                            'current': None,  # URL the process is working on
+                        })
+                    
+                    status_text.text(f"Downloading {len(urls)} videos with {workers} parallel worker(s)...")
+                    
+                    # Follow each process through its log and success files
+                    while True:
+                        running = any(shard['process'].poll() is None for shard in shards)
+                        results_changed = False
+                        
+                        for shard in shards:
+                            for line in read_new_lines(shard['log']):
+                                match = VIDEO_LINE_RE.match(line)
+                                known = match is not None and match.group(1) in url_by_id
+                                if known:
+                                    shard['current'] = url_by_id[match.group(1)]
+                                
+                                if line.startswith('ERROR:'):
+                                    # Errors are matched to URLs by video ID; the ones
+                                    # without an ID (e.g. post-processing) belong to the
+                                    # video in progress, and unknown IDs (playlist
+                                    # entries) to no URL at all
+                                    if (known or match is None) and shard['current'] is not None:
+                                        url_errors.setdefault(shard['current'], line[len('ERROR:'):].strip())
+                                elif line.startswith('[download]'):
+                                    status_text.text(line[:120])
+                            
+                            if shard['success'] is None and shard['success_file'].exists():
+                                shard['success'] = open(shard['success_file'], encoding='utf-8', errors='replace')
+                            if shard['success'] is not None:
+                                for url in read_new_lines(shard['success']):
+                                    if url in positions and url not in succeeded_urls:
+                                        succeeded_urls.add(url)
+                                        add_download_result(positions[url], url, True)
+                                        results_changed = True
                         
-                        progress_bar.progress(idx / len(urls))
+                        if results_changed:
+                            show_download_results(results_table)
                         
-                        if idx < len(urls):
-                            time.sleep(2)
+                        done = len(succeeded_urls | url_errors.keys())
+                        progress_bar.progress(min(1.0, done / max(1, len(urls))))
+                        
+                        if not running:
+                            break
+                        time.sleep(0.5)
+                    
+                finally:
+                    # Also runs when Streamlit stops or reruns the script mid-download,
+                    # so no yt-dlp process keeps going without a UI
+                    for shard in shards:
+                        if shard['process'].poll() is None:
+                            shard['process'].terminate()
+                            try:
+                                shard['process'].wait(timeout=5)
+                            except subprocess.TimeoutExpired:
+                                shard['process'].kill()
+                        shard['log'].close()
+                        if shard['success'] is not None:
+                            shard['success'].close()
+                    shutil.rmtree(batch_dir, ignore_errors=True)
+                
+                # Anything without a success record failed
+                for shard in shards:
+                    for url in shard['urls']:
+                        if url not in succeeded_urls:
+                            failed_urls.append(url)
+                            add_download_result(positions[url], url, False,
+                                                url_errors.get(url, "Unknown error"))
+                
+                show_download_results(results_table)
+                
+                successful = len(succeeded_urls)
+                failed = len(failed_urls)
+                progress_bar.progress(1.0)
+                status_text.text(f"Completed {len(urls)}/{len(urls)} videos")
                 
                 st.session_state.download_complete = True
                 
@@ -383,6 +527,7 @@ def main():
                 # Cleanup
                 if os.path.exists(cookie_path):
                     os.remove(cookie_path)
+                st.session_state.pop('cookie_hash', None)
                 
                 # Balloons for celebration
                 if successful > 0:
@@ -1,68 +1,458 @@
 import os
-import pandas as pd
+import csv
+import asyncio
+import json
+import time
+import socket
+import argparse
+import threading
+from openpyxl import load_workbook
 from pathlib import Path
 import subprocess
-import time
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+from yt_dlp import YoutubeDL
+from yt_dlp.postprocessor import PostProcessor
+from yt_dlp.utils import DownloadCancelled
+from rich.console import Group
+from rich.live import Live
+from rich.progress import (Progress, TextColumn, BarColumn, MofNCompleteColumn,
+                           DownloadColumn, TransferSpeedColumn)
+
+# yt-dlp archive of finished video IDs, kept inside the output folder
+ARCHIVE_NAME = ".ytdlp_archive.txt"
+
+# One YoutubeDL per worker thread; the extractors are only loaded once per process
+_ydl_local = threading.local()
+_downloaders = []
+_downloaders_lock = threading.Lock()
+
+# yt-dlp errors that mean YouTube is throttling us rather than the video being broken;
+# "Sign in to confirm your age" is a real failure, only the bot check is throttling
+RATE_LIMIT_MARKERS = ("HTTP Error 429", "not a bot")
+MAX_RATE_LIMIT_RETRIES = 3
+
+# More parallel downloads than this mostly buys 429s from YouTube
+MAX_DOWNLOAD_WORKERS = 6
+
+# Monotonic time before which workers must not start a new download
+_resume_at = 0.0
+_resume_lock = threading.Lock()
+
+# Set on Ctrl-C so running downloads abort and queued ones never start
+_cancel = threading.Event()
+
+# Hosts (and their subdomains) a row must point at before yt-dlp sees it
+YOUTUBE_HOSTS = ("youtube.com", "youtu.be")
+
+# Spreadsheet placeholders that aren't URLs
+BAD = frozenset(("", "nan", "none"))
+
+# Containers the deferred embed pass can attach a cover to; others get tags only
+COVER_EXTENSIONS = ('.mkv', '.mp4')
+
+# Sidecar with the tags to embed, named after the video it belongs to
+TAGS_SUFFIX = '.tags.json'
+
+# Hosts every download talks to; the googlevideo CDN nodes vary per video
+PREWARM_HOSTS = ("www.youtube.com", "i.ytimg.com", "redirector.googlevideo.com")
+
+def extract_video_id(url):
+    """Return the YouTube video ID of a URL, or None if it can't be found"""
+    parsed = urlparse(url)
+    if parsed.hostname and parsed.hostname.endswith('youtu.be'):
+        return parsed.path.strip('/').split('/')[0] or None
+    video_id = parse_qs(parsed.query).get('v', [None])[0]
+    if video_id:
+        return video_id
+    parts = parsed.path.strip('/').split('/')
+    if len(parts) >= 2 and parts[0] in ('shorts', 'live', 'embed'):
+        return parts[1]
+    return None
+
+def is_youtube_url(url):
+    """Cheap check that a row is a YouTube video or playlist link"""
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return False
+    if parsed.scheme not in ('http', 'https'):
+        return False
+    host = (parsed.hostname or '').lower()
+    if not any(host == h or host.endswith('.' + h) for h in YOUTUBE_HOSTS):
+        return False
+    return bool(extract_video_id(url) or parse_qs(parsed.query).get('list'))
+
+def load_archive_ids(archive_file):
+    """Read the video IDs recorded in a yt-dlp download archive"""
+    try:
+        with open(archive_file, encoding='utf-8') as f:
+            # Each line is '<extractor> <video id>'
+            return frozenset(line.split()[-1] for line in f if line.strip())
+    except FileNotFoundError:
+        return frozenset()
+
+class SilentLogger:
+    """yt-dlp logger that drops its output; main() prints one line per result"""
+    
+    def debug(self, msg):
+        pass
+    
+    def info(self, msg):
+        pass
+    
+    def warning(self, msg):
+        pass
+    
+    def error(self, msg):
+        pass
+
+class TagsWriterPP(PostProcessor):
+    """Write the few tags embed_video() needs beside each finished video
+    
+    Only these public fields are kept, unlike --write-info-json which dumps
+    the whole info dict.
+    """
+    
+    def run(self, info):
+        # Same tags yt-dlp's --embed-metadata writes
+        tags = {
+            'title': info.get('title'),
+            'artist': info.get('uploader'),
+            'date': info.get('upload_date'),
+            'description': info.get('description'),
+            'comment': info.get('webpage_url'),
+        }
+        with open(info['filepath'] + TAGS_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump({k: v for k, v in tags.items() if v}, f, ensure_ascii=False)
+        return [], info
+
+def build_ydl_options(output_folder, cookie_path):
+    """yt-dlp options for 1440p downloads
+    
+    Thumbnail and metadata embedding is left to embed_video() so the workers
+    move on to the next download as soon as the merge is done.
+    """
+    return {
+        'cookiefile': str(cookie_path),
+        'format': 'bestvideo[height=1440][ext=mkv]+bestaudio[ext=m4a]/bestvideo[height<=1440]+bestaudio/best',
+        'merge_output_format': 'mkv',
+        # ID-first names never collide on duplicate titles and keep long titles short
+        'outtmpl': str(Path(output_folder) / '%(id)s - %(title).80s.%(ext)s'),
+        # Leave a .jpg cover beside each video for embed_video(); the tags
+        # sidecar comes from TagsWriterPP
+        'writethumbnail': True,
+        'postprocessors': [
+            {'key': 'FFmpegThumbnailsConvertor', 'format': 'jpg', 'when': 'before_dl'},
+        ],
+        'quiet': True,
+        'no_warnings': True,
+        'noprogress': True,
+        # quiet doesn't cover report_error; failures still raise DownloadError
+        'logger': SilentLogger(),
+        # Let yt-dlp pace its own requests so parallel workers don't trip rate limits
+        'sleep_interval_requests': 1,
+        'sleep_interval': 2,
+        'max_sleep_interval': 5,
+        # Record finished videos so re-runs skip them
+        'download_archive': os.path.join(output_folder, ARCHIVE_NAME),
+        'progress_hooks': [check_cancelled],
+    }
+
+def check_cancelled(d):
+    """yt-dlp progress hook that aborts the download once the run is cancelled"""
+    if _cancel.is_set():
+        raise DownloadCancelled("Interrupted")
+
+def get_downloader(options):
+    """Return this thread's YoutubeDL, creating it on first use"""
+    ydl = getattr(_ydl_local, 'ydl', None)
+    if ydl is None:
+        ydl = _ydl_local.ydl = YoutubeDL(options)
+        ydl.add_post_processor(TagsWriterPP(), when='after_move')
+        with _downloaders_lock:
+            _downloaders.append(ydl)
+    return ydl
+
+def close_downloaders():
+    """Close the YoutubeDL instances created by the worker threads"""
+    with _downloaders_lock:
+        while _downloaders:
+            try:
+                _downloaders.pop().close()
+            except Exception:
+                # Saving the cookie jar back can fail; the downloads are already done
+                pass
+
+def prewarm_dns(hosts=PREWARM_HOSTS):
+    """Resolve the YouTube hosts in a background thread while setup continues"""
+    def resolve():
+        for host in hosts:
+            try:
+                socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+            except OSError:
+                pass
+    
+    thread = threading.Thread(target=resolve, daemon=True)
+    thread.start()
+    return thread
+
+def _optimal_workers(n_urls):
+    """Default download workers: one per usable CPU, capped for YouTube's sake"""
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    return max(1, min(n_urls, cpus, MAX_DOWNLOAD_WORKERS))
 
-def download_video(url, output_folder, cookie_file="cookies.txt"):
-    """Download video in 1440p quality"""
+def get_worker_count(n_urls, cli_workers=None):
+    """Resolve the number of parallel downloads (CLI > env > default)"""
+    workers = cli_workers or os.getenv('YTDLP_WORKERS')
+    if workers:
+        try:
+            return max(1, int(workers))
+        except ValueError:
+            print(f"⚠️  Invalid worker count '{workers}', using default")
+    return _optimal_workers(n_urls)
+
+def pause_downloads(delay):
+    """Hold back new downloads on every worker for delay seconds"""
+    global _resume_at
+    with _resume_lock:
+        _resume_at = max(_resume_at, time.monotonic() + delay)
+
+def make_progress_hook(transfers):
+    """yt-dlp progress hook that moves the calling worker's transfer bar"""
+    def hook(d):
+        task = getattr(_ydl_local, 'task', None)
+        if task is None or d.get('status') != 'downloading':
+            return
+        transfers.update(task, completed=d.get('downloaded_bytes') or 0,
+                         total=d.get('total_bytes') or d.get('total_bytes_estimate'))
+    return hook
+
+def download_video(url, options, transfers=None):
+    """Download a video in 1440p with the calling thread's YoutubeDL
+    
+    When transfers is given, the download gets its own bar there for as long
+    as it runs. Returns (status, message) where status is "ok", "failed",
+    "ratelimited" or "cancelled".
+    """
+    wait_time = _resume_at - time.monotonic()
+    if wait_time > 0:
+        _cancel.wait(wait_time)
+    if _cancel.is_set():
+        return "cancelled", "Interrupted"
+    
+    task = None
+    if transfers is not None:
+        task = transfers.add_task(extract_video_id(url) or url, total=None)
+    _ydl_local.task = task
+    try:
+        get_downloader(options).download([url])
+        return "ok", "Success"
+    except DownloadCancelled:
+        return "cancelled", "Interrupted"
+    except Exception as e:
+        message = str(e)
+        if any(marker in message for marker in RATE_LIMIT_MARKERS):
+            return "ratelimited", message
+        return "failed", message
+    finally:
+        _ydl_local.task = None
+        if task is not None:
+            transfers.remove_task(task)
+
+def _clean(values):
+    """Yield stripped URL strings, dropping blanks and placeholder cells"""
+    for value in values:
+        if not isinstance(value, str):
+            continue
+        url = value.strip()
+        if url and url.lower() not in BAD:
+            yield url
+
+def read_excel_urls(excel_file):
+    """Read the URL column of a workbook one row at a time"""
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
     try:
-        # Check if cookie file exists
-        if not os.path.exists(cookie_file):
-            print(f"ERROR: Cookie file '{cookie_file}' not found!")
-            return False
+        rows = workbook.active.iter_rows(values_only=True)
         
-        # Build command for 1440p download
-        cmd = [
-            'yt-dlp',
-            '--cookies', cookie_file,
-            '-f', 'bestvideo[height=1440][ext=mkv]+bestaudio[ext=m4a]/bestvideo[height<=1440]+bestaudio/best',
-            '--merge-output-format', 'mkv',
-            '-o', f'{output_folder}/%(title)s.%(ext)s',
-            '--embed-thumbnail',
-            '--embed-metadata',
-            '--no-warnings',
-            url
-        ]
+        # Normalize column names and pick the 'url' column, falling back to the first
+        header = [str(c).strip().lower() if c is not None else "" for c in next(rows, ())]
+        col = header.index('url') if 'url' in header else 0
         
-        print("Downloading in 1440p quality...")
-        result = subprocess.run(cmd, capture_output=False, text=True)
+        # Clean URLs properly (remove blanks, spaces, etc.)
+        return list(_clean(row[col] for row in rows if col < len(row)))
+    finally:
+        workbook.close()
+
+def read_csv_urls(csv_file):
+    """Read the URL column of a CSV file"""
+    with open(csv_file, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader, [])]
+        col = header.index('url') if 'url' in header else 0
+        return list(_clean(row[col] for row in reader if col < len(row)))
+
+def load_urls(url_file):
+    """Read URLs from a CSV or workbook, caching workbooks as CSV
+    
+    The workbook is converted once to '<name>.urls.csv' beside it; the cache
+    carries the workbook's mtime and is rebuilt whenever that changes.
+    """
+    if str(url_file).lower().endswith('.csv'):
+        return read_csv_urls(url_file)
+    
+    source_mtime = os.stat(url_file).st_mtime_ns
+    cache_file = Path(url_file).with_suffix('.urls.csv')
+    try:
+        if cache_file.stat().st_mtime_ns == source_mtime:
+            return read_csv_urls(cache_file)
+    except FileNotFoundError:
+        pass
+    
+    urls = read_excel_urls(url_file)
+    with open(cache_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['url'])
+        writer.writerows([url] for url in urls)
+    os.utime(cache_file, ns=(source_mtime, source_mtime))
+    return urls
+
+def find_pending_embeds(output_folder):
+    """List downloaded videos that still have a tags sidecar beside them
+    
+    Sidecars whose video is gone are removed so they aren't rescanned forever.
+    """
+    with os.scandir(output_folder) as entries:
+        names = {entry.name for entry in entries if entry.is_file()}
+    
+    pending = []
+    for name in names:
+        if not name.endswith(TAGS_SUFFIX):
+            continue
+        video_name = name[:-len(TAGS_SUFFIX)]
+        if video_name in names:
+            pending.append(os.path.join(output_folder, video_name))
+        else:
+            remove_sidecars(os.path.join(output_folder, video_name))
+    return pending
+
+def remove_sidecars(video_path):
+    """Delete the cover and tags files left beside a video"""
+    for path in (os.path.splitext(video_path)[0] + '.jpg', video_path + TAGS_SUFFIX):
+        if os.path.exists(path):
+            os.remove(path)
+
+async def embed_video(video_path):
+    """Embed the tags sidecar, and the cover where possible, with one ffmpeg remux
+    
+    MKV and MP4 get the .jpg cover when one was downloaded; other containers
+    and videos without a cover get the tags alone. The sidecars are removed
+    once the video has been replaced. Returns (success, message).
+    """
+    base, ext = os.path.splitext(video_path)
+    thumbnail = base + '.jpg'
+    temp_file = f"{base}.temp{ext}"
+    try:
+        with open(video_path + TAGS_SUFFIX, encoding='utf-8') as f:
+            tags = json.load(f)
         
-        if result.returncode == 0:
-            return True
+        cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-i', video_path]
+        has_cover = ext.lower() in COVER_EXTENSIONS and os.path.exists(thumbnail)
+        if has_cover and ext.lower() == '.mkv':
+            # Matroska carries covers as attachments rather than video streams
+            cmd += ['-map', '0', '-c', 'copy', '-attach', thumbnail,
+                    '-metadata:s:t', 'mimetype=image/jpeg',
+                    '-metadata:s:t', 'filename=cover.jpg']
+        elif has_cover:
+            cmd += ['-i', thumbnail, '-map', '0', '-map', '1', '-c', 'copy',
+                    '-disposition:v:1', 'attached_pic']
         else:
-            return False
-            
+            cmd += ['-map', '0', '-c', 'copy']
+        
+        for key, value in tags.items():
+            cmd += ['-metadata', f'{key}={value}']
+        cmd.append(temp_file)
+        
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE)
+        _, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            message = stderr.decode('utf-8', errors='replace').strip()
+            return False, message or f"ffmpeg exited with {proc.returncode}"
+        
+        os.replace(temp_file, video_path)
+        remove_sidecars(video_path)
+        return True, "Success"
     except Exception as e:
-        print(f"Exception: {str(e)}")
-        return False
+        return False, str(e)
+
+async def embed_all(video_paths, limit):
+    """Run embed_video() over several videos with at most limit ffmpeg processes
+    
+    Returns a list of (video_path, success, message).
+    """
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def bounded(path):
+        async with semaphore:
+            return (path, *await embed_video(path))
+    
+    return await asyncio.gather(*(bounded(path) for path in video_paths))
 
-def get_video_info(url, cookie_file="cookies.txt"):
-    """Get available formats for a video"""
+def get_video_info(url, cookie_file="cookies.txt", match=None):
+    """Get available formats for a video
+    
+    The format table is streamed line by line. When match is given (e.g.
+    "1440"), the first format line containing it is returned as soon as it
+    appears and yt-dlp is stopped without listing the rest.
+    """
     try:
         cmd = [
             'yt-dlp',
-            '--cookies', cookie_file,
+            '--cookies', str(cookie_file),
             '-F',
             url
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return result.stdout
-    except:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              text=True, bufsize=1) as process:
+            lines = []
+            for line in process.stdout:
+                if match is not None and match in line:
+                    process.terminate()
+                    return line.rstrip('\n')
+                lines.append(line)
+        
+        return None if match is not None else ''.join(lines)
+    except Exception:
         return None
 
 def main():
+    parser = argparse.ArgumentParser(description="Bulk download YouTube videos in 1440p")
+    parser.add_argument('--workers', type=int,
+                        help="Number of parallel downloads (env: YTDLP_WORKERS)")
+    args = parser.parse_args()
+    
     excel_file = "Youtube URLs.xlsx"
+    # A plain CSV list is read directly and takes precedence over the workbook
+    if os.path.exists("Youtube URLs.csv"):
+        excel_file = "Youtube URLs.csv"
     output_folder = "Downloaded_Videos"
     cookie_file = "cookies.txt"
     
     # Create output folder
     Path(output_folder).mkdir(exist_ok=True)
     
-    # Check cookie file
-    if not os.path.exists(cookie_file):
+    # Check cookie file once; workers receive the resolved path
+    try:
+        cookie_path = Path(cookie_file).resolve(strict=True)
+    except FileNotFoundError:
         print("="*70)
         print("ERROR: cookies.txt not found!")
         print("="*70)
@@ -73,88 +463,158 @@ def main():
     print("YouTube Bulk Downloader - 1440p Quality")
     print("="*70)
     
+    failed_log = None
+    failed = 0
+    interrupted = False
     try:
-        # Read Excel
-        df = pd.read_excel(excel_file)
-        
-        # Normalize column names
-        df.columns = [col.strip().lower() for col in df.columns]
-
-         # Pick correct column
-        if 'url' in df.columns:
-             url_column = 'url'
-        else:
-             url_column = df.columns[0]  # fallback to first column
-
-         # Clean URLs properly (remove blanks, spaces, etc.)
-        urls = [
-             str(u).strip()
-             for u in df[url_column]
-             if isinstance(u, str) and u.strip().lower() not in ["", "nan", "none"]
-        ]
+        # Read URL list
+        urls = load_urls(excel_file)
 
         print(f"✅ Total valid URLs found: {len(urls)}")
-
-        
-        print(f"\nFound {len(urls)} videos to download")
-        print("Quality: 1440p (or highest available)\n")
+        total = len(urls)
         
         successful = 0
-        failed = 0
-        failed_urls = []
-        
-        for idx, url in enumerate(urls, 1):
-            print(f"\n{'='*70}")
-            print(f"[{idx}/{len(urls)}] Processing Video")
-            print(f"{'='*70}")
-            print(f"URL: {url}\n")
-            
-            # Show available formats (optional - comment out if too verbose)
-            # print("Checking available formats...")
-            # formats = get_video_info(url, cookie_file)
-            # if formats:
-            #     print(formats)
-            
-            if download_video(url, output_folder, cookie_file):
-                successful += 1
-                print("\n✓ Successfully downloaded in 1440p!")
+        
+        # Failures are appended as they happen so an interrupted run keeps them
+        log_path = Path(f"failed_{datetime.now():%Y%m%d_%H%M%S}.txt")
+        failed_log = open(log_path, 'w', buffering=1, encoding='utf-8')
+        failed_log.write("Failed URLs:\n\n")
+        
+        # Rows that can't be YouTube video links are failed without calling yt-dlp
+        valid_urls = []
+        for url in urls:
+            if is_youtube_url(url):
+                valid_urls.append(url)
             else:
                 failed += 1
-                failed_urls.append(url)
-                print("\n✗ Download failed")
-            
-            print("-"*70)
-            
-            # Wait between downloads
-            if idx < len(urls):
-                wait_time = 3
-                print(f"\nWaiting {wait_time} seconds before next download...\n")
-                time.sleep(wait_time)
+                failed_log.write(f"{url}\n")
+        if failed:
+            print(f"⚠️ Skipping {failed} invalid URLs")
+        
+        # Skip videos the archive already lists without handing them to yt-dlp
+        archived = load_archive_ids(Path(output_folder) / ARCHIVE_NAME)
+        urls = [url for url in valid_urls if extract_video_id(url) not in archived]
+        skipped = len(valid_urls) - len(urls)
+        if skipped:
+            print(f"⏭️ Skipping {skipped} already downloaded videos")
+        
+        if urls:
+            prewarm_dns()
+        
+        print(f"\nFound {len(urls)} videos to download")
+        print("Quality: 1440p (or highest available)\n")
+        
+        workers = get_worker_count(len(urls), args.workers)
+        print(f"Parallel downloads: {workers}\n")
+        options = build_ydl_options(output_folder, cookie_path)
+        
+        # One overall bar plus a transfer bar per running download, redrawn
+        # together instead of printing lines from every worker
+        overall = Progress(TextColumn("{task.description}"), BarColumn(), MofNCompleteColumn())
+        transfers = Progress(TextColumn("{task.description}"), BarColumn(),
+                             DownloadColumn(), TransferSpeedColumn())
+        videos_task = overall.add_task("Videos", total=len(urls))
+        options['progress_hooks'].append(make_progress_hook(transfers))
+        
+        try:
+            with Live(Group(overall, transfers), refresh_per_second=10) as live, \
+                    ThreadPoolExecutor(max_workers=workers) as executor:
+                pending = {
+                    executor.submit(download_video, url, options, transfers): url
+                    for url in urls
+                }
+                retries = {}
+                consecutive_429 = 0
+                
+                try:
+                    while pending:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            url = pending.pop(future)
+                            status, message = future.result()
+                            
+                            # Only throttled downloads back off, and the pause grows
+                            # while YouTube keeps refusing
+                            if status == "ratelimited":
+                                consecutive_429 += 1
+                                if retries.get(url, 0) < MAX_RATE_LIMIT_RETRIES:
+                                    retries[url] = retries.get(url, 0) + 1
+                                    delay = min(60, 2 ** consecutive_429)
+                                    live.console.print(f"⏳ Rate limited, retrying in {delay}s: {url}",
+                                                       markup=False)
+                                    pause_downloads(delay)
+                                    pending[executor.submit(download_video, url, options, transfers)] = url
+                                    continue
+                            elif status == "ok":
+                                consecutive_429 = 0
+                            
+                            overall.advance(videos_task)
+                            if status == "ok":
+                                successful += 1
+                                live.console.print(f"✓ {url}", markup=False)
+                            else:
+                                failed += 1
+                                failed_log.write(f"{url}\n")
+                                live.console.print(f"✗ {url}\n  {message[:200]}", markup=False)
+                except KeyboardInterrupt:
+                    # Leaving the with block would otherwise wait for the whole queue
+                    _cancel.set()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    interrupted = True
+                    
+                    # Downloads that were running abort quickly; log the ones that
+                    # failed on their own before the interrupt reached them
+                    for future, url in pending.items():
+                        if future.cancelled():
+                            continue
+                        status, message = future.result()
+                        if status in ("failed", "ratelimited"):
+                            failed += 1
+                            failed_log.write(f"{url}\n")
+                    raise
+        finally:
+            close_downloaders()
+        
+        # Embed covers and metadata in parallel now that the downloads are done;
+        # the ffmpeg processes are awaited from one event loop, not a thread each
+        to_embed = find_pending_embeds(output_folder)
+        if to_embed:
+            print(f"\n🖼️ Embedding thumbnails and metadata into {len(to_embed)} videos...")
+            results = asyncio.run(embed_all(to_embed, os.cpu_count() or 1))
+            for path, embedded, message in results:
+                if not embedded:
+                    print(f"⚠️ Could not embed into {os.path.basename(path)}: {message[:200]}")
         
         # Summary
         print("\n" + "="*70)
         print("DOWNLOAD SUMMARY")
         print("="*70)
-        print(f"Total Videos: {len(urls)}")
+        print(f"Total Videos: {total}")
+        print(f"Already Downloaded: {skipped}")
         print(f"Successfully Downloaded: {successful}")
         print(f"Failed: {failed}")
         print(f"Save Location: {os.path.abspath(output_folder)}")
         print("="*70)
         
-        if failed_urls:
-            log_file = f"failed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-            with open(log_file, 'w') as f:
-                f.write("Failed URLs:\n\n")
-                for url in failed_urls:
-                    f.write(f"{url}\n")
-            print(f"\nFailed URLs saved to: {log_file}")
+        if failed:
+            print(f"\nFailed URLs saved to: {log_path}")
         
+    except KeyboardInterrupt:
+        print("\n⚠️ Download interrupted")
+        if failed:
+            print(f"Failed URLs so far saved to: {log_path}")
     except FileNotFoundError:
         print(f"ERROR: '{excel_file}' not found!")
     except Exception as e:
         print(f"ERROR: {str(e)}")
         import traceback
         traceback.print_exc()
+    finally:
+        if failed_log is not None:
+            failed_log.close()
+            # An interrupted run keeps its log even if nothing had failed yet
+            if not failed and not interrupted:
+                log_path.unlink()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file